@@ -1,31 +1,40 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import time 
+import itertools
+import numpy as np
 
 # ────────────────
 # 1) PING HANDLER
 # ────────────────
 # If someone visits with ?ping=1, immediately return 200 OK and exit.
-params = st.experimental_get_query_params()
-if "ping" in params:
+# Runs before st.set_page_config and the sections_data import.
+# st.query_params emits no element, so st.set_page_config below stays the first command.
+if "ping" in st.query_params:
     st.stop()  # short-circuits and returns a blank 200
 
+# st.fragment (1.37+) / st.experimental_fragment (1.33+) let a widget inside the
+# decorated function rerun just that function; older releases rerun the whole script.
+fragment = (
+    getattr(st, "fragment", None)
+    or getattr(st, "experimental_fragment", None)
+    or (lambda func: func)
+)
+
 # ────────────────
 # 2) CACHING SETUP
 # ────────────────
-@st.cache_resource  # stays alive until code changes
-def load_model():
-    # simulate heavy ML model load
-    import tensorflow as tf
-    model = tf.keras.models.load_model("path/to/model")
-    return model
-
-@st.cache_data(ttl=3600)  # refresh every hour
-def load_data():
-    import pandas as pd
-    df = pd.read_csv("data/huge_dataset.csv")
-    return df
+@st.cache_resource(show_spinner=False)  # static file, one shared copy per process
+def load_pdf_bytes(path: str) -> bytes:
+    with open(path, "rb") as pdf_file:
+        return pdf_file.read()
+
+@st.cache_resource  # one counter per process, shared by every session
+def visit_counter():
+    return itertools.count(1)
+
+@st.cache_resource(show_spinner=False)  # raw PNG bytes, served without re-encoding
+def get_logo(path: str) -> bytes:
+    with open(path, "rb") as logo_file:
+        return logo_file.read()
 
 ###############################################################################
 # 1. Page and Image Paths
@@ -44,167 +53,181 @@ logo_path = "All-In-Full-Logo-Black-Colour.png"
 ###############################################################################
 # 2. Define Categories, Questions, and Split into Two Sets
 ###############################################################################
-main_category_name = "Equity & Inclusion Self-Assessment"
-
-all_sections = {
-    "Build your knowledge": [
-        "I learn about people who are different to me.",
-        "I invest time in learning about equity & inclusion.",
-        "I leverage insights from Employee Resource Groups (or equivalent) to impact business outcomes."
-    ],
-    "Explore & grow": [
-        "I am aware of and challenge my own biases and assumptions.",
-        "I seek feedback about the impact of my actions & behaviours on others.",
-        "I take feedback seriously and course correct."
-    ],
-    "Practise self-compassion": [
-        "I accept that I will make mistakes.",
-        "I see my mistakes as opportunities to listen, learn, and improve, without dwelling on them.",
-        "If I unintentionally make a mistake, I apologise, correct myself and move on."
-    ],
-    "Centre the experiences of others": [
-        "I actively listen to the experiences of others without being judgmental or defensive.",
-        "I believe others’ experiences and challenge my own assumptions.",
-        "In discussions, I intentionally hold back from sharing my view, until others have shared their own perspectives."
-    ],
-    "Create safe spaces for dialogue": [
-        "At the beginning of group discussions, I remind participants to give each other their full attention.",
-        "I share my experiences with equity and inclusion to build trust and connection with others.",
-        "I invite people to raise concerns, even if it feels uncomfortable."
-    ],
-    "Amplify voices": [
-        "When developing ideas or making decisions, I ask 'Whose perspective are we missing?'",
-        "I advocate for individuals from marginalised groups when they’re not in the room.",
-        "I give credit to individuals whose voices are often overlooked or unheard."
-    ],
-    "Speak out": [
-        "I say something when I hear people make comments that are rooted in stereotype or assumption.",
-        "If I notice someone is being talked over or dismissed, I draw attention to it.",
-        "I challenge inequities and unfair practices when I witness them."
-    ],
-    "Make equitable & inclusive decisions": [
-        "I ensure diverse perspectives are included when developing products and services.",
-        "I prioritise equity when making hiring, promotion and other critical people decisions.",
-        "I evaluate and measure the outcomes of my decisions across different populations."
-    ],
-    "Drive accountability": [
-        "I establish equity & inclusion goals that tie to business performance.",
-        "I hold all team members accountable for creating an inclusive environment.",
-        "I reward equitable & inclusive behaviours."
-    ],
-    "Create sustainable change": [
-        "I use a data-driven approach to develop and evaluate policies.",
-        "I elevate equity & inclusion when developing and executing strategic plans.",
-        "I make equity & inclusion a priority when collaborating with others from different parts of the value chain."
-    ]
+from sections_data import all_sections, main_category_name, page_1_sections, page_2_sections
+
+# Selectbox choices for every question (1 = Never ... 4 = Often)
+OPTIONS = (1, 2, 3, 4)
+
+# Session-state key for every question, built once per process instead of on
+# every rerun: (section, question, key) in display order, plus a per-section index.
+# Keys are short positional ids ("q0", "q1", ...) rather than the full question text.
+_question_index = itertools.count()  # running position across all sections
+QUESTION_KEYS = tuple(
+    (section_name, question_text, f"q{next(_question_index)}")
+    for section_name, questions in all_sections.items()
+    for question_text in questions
+)
+FLAT_KEYS = tuple(key for _, _, key in QUESTION_KEYS)
+SECTION_KEYS = {
+    section_name: tuple((q, k) for (s, q, k) in QUESTION_KEYS if s == section_name)
+    for section_name in all_sections
+}
+
+# (buffer index, key) for every question on each page, used by the form-button callbacks
+KEY_INDEX = {key: i for i, key in enumerate(FLAT_KEYS)}
+PAGE_KEYS = {
+    page: tuple(
+        (KEY_INDEX[key], key)
+        for section_name in page_sections
+        for _, key in SECTION_KEYS[section_name]
+    )
+    for page, page_sections in ((1, page_1_sections), (2, page_2_sections))
 }
 
-# Page 1 sections
-page_1_sections = [
-    "Build your knowledge",
-    "Explore & grow",
-    "Practise self-compassion",
-    "Centre the experiences of others",
-    "Create safe spaces for dialogue"
-]
-
-# Page 2 sections
-page_2_sections = [
-    "Amplify voices",
-    "Speak out",
-    "Make equitable & inclusive decisions",
-    "Drive accountability",
-    "Create sustainable change"
-]
+# For the single category, total questions * 4 = max points
+TOTAL_QUESTIONS = len(QUESTION_KEYS)
+MAX_SCORES_PER_CATEGORY = {main_category_name: TOTAL_QUESTIONS * 4}
+
+# QUESTION_KEYS keeps each section's questions contiguous, so per-section totals
+# are one np.add.reduceat over the score array starting at SECTION_OFFSETS.
+SECTION_NAMES = tuple(all_sections)
+SECTION_SIZES = np.array([len(qlist) for qlist in all_sections.values()])
+SECTION_MAX_SCORES = SECTION_SIZES * 4
+SECTION_OFFSETS = np.concatenate(([0], np.cumsum(SECTION_SIZES)[:-1])).astype(np.intp)
 
 ###############################################################################
 # 3. Helper Functions
 ###############################################################################
 def ensure_question_keys_exist():
     """
-    For every question, initialize st.session_state with a default = 1
-    so we never see a KeyError, and each question defaults to "1".
+    For every question, initialize st.session_state so we never see a KeyError.
+    All scores are also packed into one bytearray, st.session_state["scores"]
+    (index = position in FLAT_KEYS, default 1). A selectbox key that is missing
+    (go_to_page drops the keys of the page being left) is restored from there.
+    """
+    if "scores" not in st.session_state:
+        st.session_state["scores"] = bytearray([1]) * TOTAL_QUESTIONS
+    packed = st.session_state["scores"]
+    existing = set(st.session_state.keys())  # one pass over session_state
+    for i, key in enumerate(FLAT_KEYS):
+        if key not in existing:
+            st.session_state[key] = packed[i]
+
+def save_scores(page):
+    """
+    Form-button callback: writes the submitted page's selectbox values through
+    to the packed st.session_state["scores"] buffer. Only that page's keys are
+    read; the other page's keys may hold stale widget values.
     """
-    for section_name, questions in all_sections.items():
-        for question_text in questions:
-            key = f"{main_category_name}_{section_name}_{question_text}"
-            if key not in st.session_state:
-                st.session_state[key] = 1
+    state = st.session_state.to_dict()
+    packed = st.session_state["scores"]
+    for i, key in PAGE_KEYS[page]:
+        if key in state:
+            packed[i] = state[key]
 
 def display_sections(section_list):
     """
     Displays the given sections (subsets of all_sections) as headings + selectboxes.
-    The default is already set to 1 in session_state.
-    Returns all user responses as a list of dicts.
+    Every key is already in session_state, so each selectbox shows the stored
+    score without an index lookup. The form buttons copy the chosen scores into
+    the packed buffer (save_scores), so nothing is returned.
     """
-    responses = []
     for section_name in section_list:
         st.markdown(f"### {section_name}")
-        questions = all_sections[section_name]
-        for question_text in questions:
-            key = f"{main_category_name}_{section_name}_{question_text}"
-            # Because we set a default to 1, st.session_state[key] should be 1 unless changed
-            current_val = st.session_state[key]
-            chosen_score = st.selectbox(
+        for question_text, key in SECTION_KEYS[section_name]:
+            # No index: a non-default index next to a session_state value set this
+            # run (a restored answer) makes Streamlit warn, and the value wins anyway
+            st.selectbox(
                 label=question_text,
-                options=[1, 2, 3, 4],
-                index=[1, 2, 3, 4].index(current_val),
+                options=OPTIONS,
                 key=key
             )
-            responses.append({
-                "category": main_category_name,
-                "type": section_name,
-                "question": question_text,
-                "score": chosen_score
-            })
-    return responses
-
-def calculate_total_scores_per_category(responses):
-    totals = {}
-    for r in responses:
-        cat = r["category"]
-        if cat not in totals:
-            totals[cat] = 0
-        totals[cat] += r["score"]
-    return totals
-
-def calculate_max_scores_per_category():
-    """For the single category, total questions * 4 = max points."""
-    total_questions = sum(len(qlist) for qlist in all_sections.values())
-    return {main_category_name: total_questions * 4}
-
-def custom_progress_bar(percentage, color="#377bff"):
+
+def go_to_page(page):
     """
-    Creates a horizontal progress bar with the given percentage and color in Streamlit.
+    Form-button callback: switches page before the rerun, so no extra rerun is needed.
+    Leaving a page discards any results computed from the previous answers, and
+    drops that page's widget keys so ensure_question_keys_exist restores them
+    from the buffer next time instead of reusing stale widget values.
     """
-    st.markdown(
-        f"""
-        <div style="width: 100%; background-color: #e0e0e0; border-radius: 5px;">
-            <div style="width: {percentage}%; background-color: {color}; padding: 5px; color: white; text-align: center; border-radius: 5px;">
-                {percentage}%
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+    leaving = st.session_state["page"]
+    save_scores(leaving)
+    for _, key in PAGE_KEYS[leaving]:
+        st.session_state.pop(key, None)
+    st.session_state["page"] = page
+    st.session_state.pop("results", None)
+
+def calculate_results():
+    """
+    Reads the packed scores from session_state and returns the per-category totals
+    and the per-section bar chart. Run once per Submit; main() keeps the
+    result in session_state so later reruns reuse the chart instead of
+    rebuilding it.
+    """
+    # One slot per question, viewed in place without copying
+    scores = np.frombuffer(st.session_state["scores"], dtype=np.uint8)
+
+    # Build data for bar charts by sub-sections
+    section_totals = np.add.reduceat(scores, SECTION_OFFSETS, dtype=np.intp)
+    section_pcts = section_totals / SECTION_MAX_SCORES * 100
+    flattened_scores = [
+        {
+            "Category": main_category_name,
+            "Type": section_name,
+            "Score": int(sub_score),
+            "Percentage": float(sub_pct)
+        }
+        for section_name, sub_score, sub_pct in zip(SECTION_NAMES, section_totals, section_pcts)
+    ]
+
+    return {
+        # Total for the single category
+        "totals": {main_category_name: int(scores.sum())},
+        "chart": make_bar_chart(flattened_scores)
+    }
+
+def make_bar_chart(scores_data):
+    """
+    Builds a single bar chart of the percentage for each sub-type.
+    scores_data is a list of row dicts, passed to Vega-Lite as-is (no DataFrame).
+    """
+    import altair as alt  # only needed once results are shown
+
+    return alt.Chart(alt.Data(values=scores_data)).mark_bar(color="#377bff").encode(
+        x=alt.X("Percentage:Q", scale=alt.Scale(domain=[0, 100])),
+        y=alt.Y("Type:N", sort=None, title=None),  # rows already in section order
+    ).properties(title=main_category_name, height=300)
 
-def custom_bar_chart(scores_data):
+@fragment
+def show_results(results):
     """
-    Displays a bar chart per category, showing the percentage for each sub-type.
+    Draws the stored results from calculate_results(). Runs as a fragment, so
+    clicking the download button reruns only this panel, not the questions above.
     """
+    st.write("## Assessment Complete. Here are your results:")
+
+    # Show per-category progress bars
+    for cat_name, cat_score in results["totals"].items():
+        cat_max = MAX_SCORES_PER_CATEGORY[cat_name]
+        pct = int(cat_score / cat_max * 100)
+        # Label and bar go out as one native element
+        st.progress(pct / 100, text=f"**{cat_name}: {cat_score} out of {cat_max}** ({pct}%)")
+
+    # Chart was built once by calculate_results(); only send it again here
     st.markdown("<h3>Self Assessment Scores by Category and Type</h3>", unsafe_allow_html=True)
-    for category in scores_data["Category"].unique():
-        st.markdown(f"### {category}", unsafe_allow_html=True)
-        cat_data = scores_data[scores_data["Category"] == category].sort_values(by=["Type"], ascending=False)
-
-        fig, ax = plt.subplots(figsize=(10, 4))
-        ax.barh(cat_data["Type"], cat_data["Percentage"], color='#377bff')
-        ax.set_xlim(0, 100)
-        ax.set_xlabel('Percentage', fontsize=12)
-        ax.set_title(category, fontsize=14)
-        ax.tick_params(axis='both', which='major', labelsize=10)
-        plt.tight_layout()
-        st.pyplot(fig)
+    st.altair_chart(results["chart"], use_container_width=True)
+
+    # Provide the existing PDF for download
+    try:
+        PDF_CONTENT = load_pdf_bytes(EXISTING_PDF_PATH)
+        st.download_button(
+            label="Understand your results",
+            data=PDF_CONTENT,
+            file_name="allyship_guide.pdf",
+            mime="application/pdf"
+        )
+    except FileNotFoundError:
+        st.error("PDF file not found. Check your path or filename.")
 
 ###############################################################################
 # 4. Main Streamlit UI
@@ -217,103 +240,53 @@ def main():
     if "page" not in st.session_state:
         st.session_state["page"] = 1
 
-    # Track visits
+    # Track visits: each new session takes the next number from the process-wide counter
     if "unique_visits" not in st.session_state:
-        st.session_state["unique_visits"] = 0
-    st.session_state["unique_visits"] += 1
+        st.session_state["unique_visits"] = next(visit_counter())
 
     # Show the logo
     try:
-        st.image(logo_path, width=200)
+        st.image(get_logo(logo_path), width=200)
     except Exception as e:
         st.error("Logo image not found. Please check the path to the logo image.")
         st.write(e)
 
     st.title("Actionable Allyship Self-Assessment")
-    st.write(
-        """This confidential assessment aligns with the All In Action Framework. It is designed to reveal your current allyship strengths and opportunities for growth. 
-        Read each of the action statements and give each one a score from 1-4 based on how often you demonstrate them. 
-        It should take no longer than 10 minutes to complete and will provide you with a personalised set of results to support your ongoing leadership development"""
+    # Intro and rating scale go out as one markdown element
+    st.markdown(
+        "This confidential assessment aligns with the All In Action Framework. It is designed to reveal your current allyship strengths and opportunities for growth. "
+        "Read each of the action statements and give each one a score from 1-4 based on how often you demonstrate them. "
+        "It should take no longer than 10 minutes to complete and will provide you with a personalised set of results to support your ongoing leadership development"
+        "\n\n"
+        "### Rating Scale: 1 = Never | 2 = Rarely | 3 = Sometimes | 4 = Often"
     )
-    st.write("### Rating Scale: 1 = Never | 2 = Rarely | 3 = Sometimes | 4 = Often")
 
     # PAGE 1
     if st.session_state["page"] == 1:
         st.markdown(f"## Page 1")
-        display_sections(page_1_sections)
+        # Answers are batched in a form, so changing a selectbox doesn't rerun the script
+        with st.form("page_1"):
+            display_sections(page_1_sections)
 
-        # Button -> go to Page 2
-        if st.button("Next →"):
-            st.session_state["page"] = 2
-            st.experimental_rerun()
+            # Button -> go to Page 2
+            st.form_submit_button("Next →", on_click=go_to_page, args=(2,))
 
     # PAGE 2
     elif st.session_state["page"] == 2:
         st.markdown(f"## Page 2")
-        display_sections(page_2_sections)
-
-        # "Back" button to revisit Page 1
-        if st.button("← Back"):
-            st.session_state["page"] = 1
-            st.experimental_rerun()  # Re-run the script so it shows Page 1 immediately
-
-        if st.button("Submit"):
-            # Gather all responses from session_state
-            all_responses = []
-            for section_name, questions in all_sections.items():
-                for question_text in questions:
-                    key = f"{main_category_name}_{section_name}_{question_text}"
-                    score_val = st.session_state.get(key, 1)  # fallback if missing
-                    all_responses.append({
-                        "category": main_category_name,
-                        "type": section_name,
-                        "question": question_text,
-                        "score": score_val
-                    })
-
-            st.write("## Assessment Complete. Here are your results:")
-
-            # Calculate total + per-category
-            total_scores_per_cat = calculate_total_scores_per_category(all_responses)
-            max_scores_per_cat = calculate_max_scores_per_category()
-            # Show per-category progress bars
-            for cat_name, cat_score in total_scores_per_cat.items():
-                cat_max = max_scores_per_cat[cat_name]
-                st.write(f"**{cat_name}: {cat_score} out of {cat_max}**")
-                pct = int(cat_score / cat_max * 100)
-                custom_progress_bar(pct)
-
-            # Build data for bar charts by sub-sections
-            flattened_scores = []
-            for section_name, question_list in all_sections.items():
-                sub_scores = sum(
-                    r["score"] for r in all_responses 
-                    if r["type"] == section_name
-                )
-                sub_max = len(question_list) * 4
-                sub_pct = (sub_scores / sub_max) * 100
-                flattened_scores.append({
-                    "Category": main_category_name,
-                    "Type": section_name,
-                    "Score": sub_scores,
-                    "Percentage": sub_pct
-                })
-
-            scores_df = pd.DataFrame(flattened_scores)
-            custom_bar_chart(scores_df)
-
-            # Provide the existing PDF for download
-            try:
-                with open(EXISTING_PDF_PATH, "rb") as pdf_file:
-                    PDF_CONTENT = pdf_file.read()
-                st.download_button(
-                    label="Understand your results",
-                    data=PDF_CONTENT,
-                    file_name="allyship_guide.pdf",
-                    mime="application/pdf"
-                )
-            except FileNotFoundError:
-                st.error("PDF file not found. Check your path or filename.")
+        with st.form("page_2"):
+            display_sections(page_2_sections)
+
+            # "Back" button to revisit Page 1 (saves the Page 2 answers to the buffer first)
+            st.form_submit_button("← Back", on_click=go_to_page, args=(1,))
+            submitted = st.form_submit_button("Submit", on_click=save_scores, args=(2,))
+
+        if submitted:
+            st.session_state["results"] = calculate_results()
+
+        # Results survive later reruns (e.g. the download click) without recomputing
+        if "results" in st.session_state:
+            show_results(st.session_state["results"])
 
     # Footer
     st.markdown(
@@ -0,0 +1,77 @@
+"""
+Assessment content: the category name, every section's action statements,
+and how the sections are split across the two pages.
+"""
+
+main_category_name = "Equity & Inclusion Self-Assessment"
+
+all_sections = {
+    "Build your knowledge": (
+        "I learn about people who are different to me.",
+        "I invest time in learning about equity & inclusion.",
+        "I leverage insights from Employee Resource Groups (or equivalent) to impact business outcomes."
+    ),
+    "Explore & grow": (
+        "I am aware of and challenge my own biases and assumptions.",
+        "I seek feedback about the impact of my actions & behaviours on others.",
+        "I take feedback seriously and course correct."
+    ),
+    "Practise self-compassion": (
+        "I accept that I will make mistakes.",
+        "I see my mistakes as opportunities to listen, learn, and improve, without dwelling on them.",
+        "If I unintentionally make a mistake, I apologise, correct myself and move on."
+    ),
+    "Centre the experiences of others": (
+        "I actively listen to the experiences of others without being judgmental or defensive.",
+        "I believe others’ experiences and challenge my own assumptions.",
+        "In discussions, I intentionally hold back from sharing my view, until others have shared their own perspectives."
+    ),
+    "Create safe spaces for dialogue": (
+        "At the beginning of group discussions, I remind participants to give each other their full attention.",
+        "I share my experiences with equity and inclusion to build trust and connection with others.",
+        "I invite people to raise concerns, even if it feels uncomfortable."
+    ),
+    "Amplify voices": (
+        "When developing ideas or making decisions, I ask 'Whose perspective are we missing?'",
+        "I advocate for individuals from marginalised groups when they’re not in the room.",
+        "I give credit to individuals whose voices are often overlooked or unheard."
+    ),
+    "Speak out": (
+        "I say something when I hear people make comments that are rooted in stereotype or assumption.",
+        "If I notice someone is being talked over or dismissed, I draw attention to it.",
+        "I challenge inequities and unfair practices when I witness them."
+    ),
+    "Make equitable & inclusive decisions": (
+        "I ensure diverse perspectives are included when developing products and services.",
+        "I prioritise equity when making hiring, promotion and other critical people decisions.",
+        "I evaluate and measure the outcomes of my decisions across different populations."
+    ),
+    "Drive accountability": (
+        "I establish equity & inclusion goals that tie to business performance.",
+        "I hold all team members accountable for creating an inclusive environment.",
+        "I reward equitable & inclusive behaviours."
+    ),
+    "Create sustainable change": (
+        "I use a data-driven approach to develop and evaluate policies.",
+        "I elevate equity & inclusion when developing and executing strategic plans.",
+        "I make equity & inclusion a priority when collaborating with others from different parts of the value chain."
+    )
+}
+
+# Page 1 sections
+page_1_sections = (
+    "Build your knowledge",
+    "Explore & grow",
+    "Practise self-compassion",
+    "Centre the experiences of others",
+    "Create safe spaces for dialogue"
+)
+
+# Page 2 sections
+page_2_sections = (
+    "Amplify voices",
+    "Speak out",
+    "Make equitable & inclusive decisions",
+    "Drive accountability",
+    "Create sustainable change"
+)